@@ -3,4 +3,6 @@ from pathlib import Path
 
 # TODO: A CLI with click
 
-folder_to_csv(Path("/home/k/Documents/all_games"), Path("/home/k/all_games.csv"))
+# Guarded so worker processes spawned by folder_to_csv don't kick off another catalogue run on import
+if __name__ == "__main__":
+    folder_to_csv(Path("/home/k/Documents/all_games"), Path("/home/k/all_games.csv"))
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from attr import dataclass
+from attrs import define
 from enum import Enum
 from .utils import UNKNOWN_STR, str2bool
 
@@ -30,7 +30,20 @@ class Mapper(Enum):
     GBCAMERA = "Game Boy Camera"
 
 
-@dataclass(frozen=True)
+_MAPPER_BY_VALUE = {m.value: m for m in Mapper}
+"""Mapper value to Mapper, skips the Enum machinery when loading carts back in"""
+
+_HARDWARE_SUFFIXES = (
+    ("ram", "+RAM"),
+    ("timer", "+Timer"),
+    ("rumble", "+Rumble"),
+    ("battery", "+Battery"),
+    ("sensor", "+Sensor"),
+)
+"""Hardware flag and the suffix it adds to the cart type string, in display order"""
+
+
+@define(frozen=True, slots=True)
 class CartHardware:
     """All the different hardware capabilities that can exist inside of a cartridge"""
     mapper: Mapper
@@ -61,109 +74,51 @@ class CartHardware:
             rumble=str2bool(ins["rumble"]),
             sensor=str2bool(ins["sensor"]),
             battery=str2bool(ins["battery"]),
-            mapper=Mapper(ins["mapper"])
+            mapper=_MAPPER_BY_VALUE.get(ins["mapper"], Mapper.Unknown)
         )
 
     @classmethod
     def from_cart(cls, data: int) -> CartHardware:
         """Take the cart type byte and translate it into a cart type and mapper"""
-        if data == 0:
-            return CartHardware(
-                mapper=Mapper.ROM_ONLY,
-            )
-        if data == 1:
-            return CartHardware(
-                mapper=Mapper.MBC1,
-            )
-        if data == 2:
-            return CartHardware(mapper=Mapper.MBC1, ram=True)
-        if data == 3:
-            return CartHardware(mapper=Mapper.MBC1, ram=True, battery=True)
-        if data == 5:
-            return CartHardware(
-                mapper=Mapper.MBC2,
-            )
-        if data == 6:
-            return CartHardware(mapper=Mapper.MBC2, battery=True)
-        if data == 8:
-            return CartHardware(mapper=Mapper.ROM_RAM, ram=True)
-        if data == 9:
-            return CartHardware(
-                mapper=Mapper.ROM_ONLY,
-            )
-        if data == 11:
-            return CartHardware(
-                mapper=Mapper.MMM01,
-            )
-        if data == 12:
-            return CartHardware(mapper=Mapper.MMM01, ram=True)
-        if data == 13:
-            return CartHardware(mapper=Mapper.MMM01, ram=True, battery=True)
-        if data == 15:
-            return CartHardware(mapper=Mapper.MBC3, battery=True, timer=True)
-        if data == 16:
-            return CartHardware(mapper=Mapper.MBC3, battery=True, timer=True, ram=True)
-        if data == 17:
-            return CartHardware(
-                mapper=Mapper.MBC3,
-            )
-        if data == 18:
-            return CartHardware(mapper=Mapper.MBC3, ram=True)
-        if data == 19:
-            return CartHardware(mapper=Mapper.MBC3, ram=True, battery=True)
-        if data == 21:
-            return CartHardware(
-                mapper=Mapper.MBC4,
-            )
-        if data == 22:
-            return CartHardware(mapper=Mapper.MBC4, ram=True)
-        if data == 23:
-            return CartHardware(mapper=Mapper.MBC4, ram=True, battery=True)
-        if data == 25:
-            return CartHardware(
-                mapper=Mapper.MBC5,
-            )
-        if data == 26:
-            return CartHardware(mapper=Mapper.MBC5, ram=True)
-        if data == 27:
-            return CartHardware(mapper=Mapper.MBC5, ram=True, battery=True)
-        if data == 28:
-            return CartHardware(
-                mapper=Mapper.MBC5,
-                rumble=True,
-            )
-        if data == 29:
-            return CartHardware(mapper=Mapper.MBC5, rumble=True, ram=True)
-        if data == 30:
-            return CartHardware(mapper=Mapper.MBC5, rumble=True, ram=True, battery=True)
-        if data == 0x20:
-            return CartHardware(
-                mapper=Mapper.MBC6,
-            )
-        if data == 0x22:
-            return CartHardware(
-                mapper=Mapper.MBC7, rumble=True, sensor=True, ram=True, battery=True
-            )
-        if data == 252:
-            return CartHardware(
-                mapper=Mapper.GBCAMERA,
-            )
-        if data == 0xFD:
-            return CartHardware(
-                mapper=Mapper.TAMA5,
-            )
-        if data == 0xFE:
-            return CartHardware(
-                mapper=Mapper.HuC3,
-            )
-        if data == 0xFF:
-            return CartHardware(mapper=Mapper.HuC1, ram=True, battery=True)
-        return CartHardware(mapper=Mapper.Unknown)
+        return _CART_TYPE_TABLE.get(data, _UNKNOWN_HW)
 
     def __str__(self):
-        return (
-            f"{self.mapper.value}{'+RAM' if self.ram else ''}{'+Timer' if self.timer else ''}"
-            f"{'+Rumble' if self.rumble else ''}{'+Battery' if self.battery else ''}"
-            f"{'+Sensor' if self.sensor else ''}"
-        )
+        return self.mapper.value + "".join(suffix for attr, suffix in _HARDWARE_SUFFIXES if getattr(self, attr))
+
+
+_UNKNOWN_HW = CartHardware(mapper=Mapper.Unknown)
 
+_CART_TYPE_TABLE = {
+    0x00: CartHardware(mapper=Mapper.ROM_ONLY),
+    0x01: CartHardware(mapper=Mapper.MBC1),
+    0x02: CartHardware(mapper=Mapper.MBC1, ram=True),
+    0x03: CartHardware(mapper=Mapper.MBC1, ram=True, battery=True),
+    0x05: CartHardware(mapper=Mapper.MBC2),
+    0x06: CartHardware(mapper=Mapper.MBC2, battery=True),
+    0x08: CartHardware(mapper=Mapper.ROM_RAM, ram=True),
+    0x09: CartHardware(mapper=Mapper.ROM_ONLY),
+    0x0B: CartHardware(mapper=Mapper.MMM01),
+    0x0C: CartHardware(mapper=Mapper.MMM01, ram=True),
+    0x0D: CartHardware(mapper=Mapper.MMM01, ram=True, battery=True),
+    0x0F: CartHardware(mapper=Mapper.MBC3, battery=True, timer=True),
+    0x10: CartHardware(mapper=Mapper.MBC3, battery=True, timer=True, ram=True),
+    0x11: CartHardware(mapper=Mapper.MBC3),
+    0x12: CartHardware(mapper=Mapper.MBC3, ram=True),
+    0x13: CartHardware(mapper=Mapper.MBC3, ram=True, battery=True),
+    0x15: CartHardware(mapper=Mapper.MBC4),
+    0x16: CartHardware(mapper=Mapper.MBC4, ram=True),
+    0x17: CartHardware(mapper=Mapper.MBC4, ram=True, battery=True),
+    0x19: CartHardware(mapper=Mapper.MBC5),
+    0x1A: CartHardware(mapper=Mapper.MBC5, ram=True),
+    0x1B: CartHardware(mapper=Mapper.MBC5, ram=True, battery=True),
+    0x1C: CartHardware(mapper=Mapper.MBC5, rumble=True),
+    0x1D: CartHardware(mapper=Mapper.MBC5, rumble=True, ram=True),
+    0x1E: CartHardware(mapper=Mapper.MBC5, rumble=True, ram=True, battery=True),
+    0x20: CartHardware(mapper=Mapper.MBC6),
+    0x22: CartHardware(mapper=Mapper.MBC7, rumble=True, sensor=True, ram=True, battery=True),
+    0xFC: CartHardware(mapper=Mapper.GBCAMERA),
+    0xFD: CartHardware(mapper=Mapper.TAMA5),
+    0xFE: CartHardware(mapper=Mapper.HuC3),
+    0xFF: CartHardware(mapper=Mapper.HuC1, ram=True, battery=True),
+}
+"""Cart type byte to hardware LUT. CartHardware is frozen, so every cart of the same type shares one instance"""
@@ -1,18 +1,26 @@
 from __future__ import annotations
 
-from attr import dataclass
+from attrs import define
 
 import csv
+import struct
 import typing
 import hashlib
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from .cart_hardware import CartHardware, CGBFunctionality, Mapper
 from .utils import str2bool, UNKNOWN_STR
 
+_NONPRINTABLE = bytes(b for b in range(256) if not ord(" ") <= b <= ord("~"))
+"""Every byte value outside of printable ascii, for use as a bytes.translate() delete table"""
 
-@dataclass(frozen=True)
+_CGB_MAP = {0x80: CGBFunctionality.CGBExtra, 0xC0: CGBFunctionality.CGBOnly}
+"""CGB flag byte to CGB functionality. Anything else means the cart has no CGB functionality"""
+
+
+@define(frozen=True, slots=True)
 class Cart:
     """Hold all the metadata about a cartridge"""
 
@@ -30,10 +38,22 @@ class Cart:
     DEST_CODE_ADDR = 0x14A
     LGC_LIC_CODE_ADDR = 0x14B
     MASK_ROM_VER_ADDR = 0x14C
+    HEADER_LEN = 0x150
+    HASH_CHUNK_SIZE = 0x10000
+    HEADER_STRUCT = struct.Struct("<BxxBBBxBxB")
+    """
+    Single byte header fields from CGB_FLAG_ADDR through MASK_ROM_VER_ADDR: CGB flag, SGB flag, cart type, ROM bank
+    shift, destination code and mask ROM version. The licensee and RAM size bytes are skipped, their helpers read them
+    """
 
     ROM_BANKSIZE = 0x4000
     RAM_BANKSIZE = 0x1000
 
+    RAM_SIZES = (0, 0, 2048, RAM_BANKSIZE * 4, RAM_BANKSIZE * 16, RAM_BANKSIZE * 8)
+    """RAM size in bytes, indexed by the RAM size byte in the header"""
+    RAM_BANK_COUNTS = (0, 0, 1, 4, 16, 8)
+    """RAM bank count, indexed by the RAM size byte in the header"""
+
     hardware: CartHardware
     rom_banks: int
     ram_banks: int
@@ -46,6 +66,7 @@ class Cart:
     licensee: str
     old_licensee_flag: bool
     md5sum: str
+    weird: bool
 
     @property
     def rom_size(self) -> int:
@@ -57,24 +78,21 @@ class Cart:
             f"{self.title}: {self.hardware}. ROM: {self.rom_size} Bytes ({self.rom_banks} Banks). "
             f"RAM {self.ram_size} Bytes ({self.ram_banks} Banks). "
             f"Lic. By {self.licensee} {' (Old Lic. Code)' if self.old_licensee_flag else ''}"
-            f"{' !Wierd!' if self.is_weird else ''}"
+            f"{' !Wierd!' if self.weird else ''}"
         )
 
-    @property
-    def is_weird(self) -> bool:
+    @staticmethod
+    def check_weird(hardware: CartHardware, licensee: str, rom_banks: int, ram_banks: int) -> bool:
         """
         This should be set if the metadata is off or not being reported correctly. Ex: Unknown mapper, huge ROM or RAM
         sizes, unknown publisher, etc
         """
-        if UNKNOWN_STR in self.hardware.mapper.value:
-            return True
-        if UNKNOWN_STR in self.licensee:
-            return True
-        if self.rom_banks > 512:
-            return True
-        if self.ram_banks > 16:
-            return True
-        return False
+        return (
+            UNKNOWN_STR in hardware.mapper.value
+            or UNKNOWN_STR in licensee
+            or rom_banks > 512
+            or ram_banks > 16
+        )
 
 
     @property
@@ -94,7 +112,7 @@ class Cart:
                 "old_lic_flag": self.old_licensee_flag,
                 "md5sum": self.md5sum,
                 "hardware": self.hardware.dict,
-                "weird": f"{self.is_weird}",
+                "weird": f"{self.weird}",
             }
         }
 
@@ -102,50 +120,58 @@ class Cart:
     def from_dict(cls, ins: dict) -> Cart:
         """Structure data from a dict into a Cartridge"""
         title = ins.keys()[0]
+        hardware = CartHardware.from_dict(ins[title]["hardware"])
+        rom_banks = int(ins[title]["rom_banks"])
+        ram_banks = int(ins[title]["ram_banks"])
+        licensee = ins[title]["licensee"]
         return Cart(
             title=title,
-            rom_banks=int(ins[title]["rom_banks"]),
-            ram_banks=int(ins[title]["ram_banks"]),
+            rom_banks=rom_banks,
+            ram_banks=ram_banks,
             ram_size=int(ins[title]["ram_size_bytes"]),
             cgb_func=CGBFunctionality(ins[title]["cgb_func"]),
             sgb_flag=str2bool(ins[title]["sgb_flag"]),
             region=ins[title]["region"],
             mask_rom_ver=int(ins[title]["mask_rom_ver"]),
-            licensee=ins[title]["licensee"],
+            licensee=licensee,
             md5sum=ins[title]["md5sum"],
             old_licensee_flag=str2bool(ins[title]["old_lic_flag"]),
-            hardware=CartHardware.from_dict(ins[title]["hardware"])
+            hardware=hardware,
+            weird=cls.check_weird(hardware, licensee, rom_banks, ram_banks),
         )
 
     @classmethod
     def from_bytes(cls, cart_data: bytes) -> Cart:
         """Generate cartridge from raw bytes from ROM"""
-        hardware = CartHardware.from_cart(cart_data[cls.CART_TYPE_ADDR])
+        return cls.from_header(cart_data, md5sum=hashlib.md5(cart_data).hexdigest())
+
+    @classmethod
+    def from_header(cls, cart_data: bytes, md5sum: str) -> Cart:
+        """Generate cartridge from just the ROM header, plus the MD5 of the full ROM since it can't be derived here"""
+        cgb_flag, sgb_flag, cart_type, rom_bank_shift, dest_code, mask_rom_ver = cls.HEADER_STRUCT.unpack_from(
+            cart_data, cls.CGB_FLAG_ADDR
+        )
+        hardware = CartHardware.from_cart(cart_type)
         ramsize, rambanks = cls.calculate_ram_size(
             data=cart_data, mapper=hardware.mapper
         )
-        if cart_data[cls.CGB_FLAG_ADDR] == 0x80:
-            cgb_func = CGBFunctionality.CGBExtra
-        elif cart_data[cls.CGB_FLAG_ADDR] == 0xC0:
-            cgb_func = CGBFunctionality.CGBOnly
-        else:
-            cgb_func = CGBFunctionality.CGBNone
+        cgb_func = _CGB_MAP.get(cgb_flag, CGBFunctionality.CGBNone)
         licensee, old_licensee_flag = cls.get_licensee_code(data=cart_data)
+        rom_banks = 2 << rom_bank_shift
         return Cart(
             hardware=hardware,
-            rom_banks=2 << cart_data[cls.ROM_BANK_SHIFT_ADDR],
+            rom_banks=rom_banks,
             ram_size=ramsize,
             ram_banks=rambanks,
             title=cls.get_title(data=cart_data),
             cgb_func=cgb_func,
-            sgb_flag=cart_data[cls.SGB_FLAG_ADDR] == 0x3,
-            region="Japan"
-            if not cart_data[cls.DEST_CODE_ADDR]
-            else f"Non-Japan ({hex(cart_data[cls.DEST_CODE_ADDR])})",
-            mask_rom_ver=cart_data[cls.MASK_ROM_VER_ADDR],
+            sgb_flag=sgb_flag == 0x3,
+            region="Japan" if not dest_code else f"Non-Japan ({hex(dest_code)})",
+            mask_rom_ver=mask_rom_ver,
             licensee=licensee,
             old_licensee_flag=old_licensee_flag,
-            md5sum=hashlib.md5(cart_data).hexdigest()
+            md5sum=md5sum,
+            weird=cls.check_weird(hardware, licensee, rom_banks, rambanks),
         )
 
     @classmethod
@@ -159,6 +185,10 @@ class Cart:
             raw_lic_code = data[
                 cls.LIC_CODE_ADDR : cls.LIC_CODE_ADDR + cls.LIC_CODE_LEN
             ]
+            lic_code = cls.LICENSEE_CODE_BYTES.get(raw_lic_code)
+            if lic_code is not None:
+                return lic_code, False
+            # Not a clean two character code, try again with any junk bytes stripped out
             cleaned_lic_code = cls.strip_nonprintable_bytes(raw_lic_code)
             lic_code = cls.LICENSEE_CODE.get(cleaned_lic_code)
             if lic_code is None:
@@ -174,32 +204,36 @@ class Cart:
     @staticmethod
     def strip_nonprintable_bytes(data: bytes) -> str:
         """Strip everything that is not printable ascii"""
-        ret = ""
-        for datum in data:
-            if ord(" ") <= datum <= ord("~"):
-                ret += chr(datum)
-        return ret
+        return data.translate(None, _NONPRINTABLE).decode("ascii")
 
     @classmethod
     def from_rom_file(cls, file: Path) -> Cart:
         """Generate a cartridge from a ROM file"""
-        return cls.from_bytes(file.read_bytes())
+        header, md5sum = cls.read_rom_file(file=file)
+        return cls.from_header(header, md5sum=md5sum)
+
+    @classmethod
+    def read_rom_file(cls, file: Path) -> typing.Tuple[bytes, str]:
+        """Pull just the header and the MD5 of the whole ROM out of a ROM file"""
+        with open(file, "rb") as f:
+            header = f.read(cls.HEADER_LEN)
+            md5 = hashlib.md5(header)
+            # Stream the rest through a reusable buffer so the whole ROM is never held in memory
+            buf = bytearray(cls.HASH_CHUNK_SIZE)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                md5.update(view[:n])
+        return header, md5.hexdigest()
 
     @classmethod
     def calculate_ram_size(cls, data: bytes, mapper: Mapper) -> typing.Tuple[int, int]:
         """Calculate the RAM size of a cart. This is kind of random, so it needs to be a LUT"""
-        ram_size = data[cls.RAM_BANK_COUNT_ADDR]
         # Handle MBC2 w/ battery backed RAM. Only 256 bytes, split among 512 4 bit memory locations
-        if mapper == Mapper.MBC2:
+        if mapper is Mapper.MBC2:
             return 256, 1
-        if ram_size == 2:
-            return 2048, 1
-        if ram_size == 3:
-            return cls.RAM_BANKSIZE * 4, 4
-        if ram_size == 4:
-            return cls.RAM_BANKSIZE * 16, 16
-        if ram_size == 5:
-            return cls.RAM_BANKSIZE * 8, 8
+        ram_size = data[cls.RAM_BANK_COUNT_ADDR]
+        if ram_size < len(cls.RAM_SIZES):
+            return cls.RAM_SIZES[ram_size], cls.RAM_BANK_COUNTS[ram_size]
         return 0, 0
 
     OLD_LICENSEE_CODE = {
@@ -429,12 +463,21 @@ class Cart:
     }
     """GBC licensee and later GB licensee codes. Many are unpopulated, please populate if you know them!"""
 
+    LICENSEE_CODE_BYTES = {k.encode("ascii"): v for k, v in LICENSEE_CODE.items()}
+    """LICENSEE_CODE keyed by the raw bytes as they appear in the header, so the common case needs no decoding"""
+
+
+CSV_BUFFER_SIZE = 1 << 20
+"""Write buffer size for the catalogue CSV, big enough that writing rows doesn't mean a syscall per ROM"""
+CSV_BATCH_ROWS = 1024
+"""How many catalogued ROMs to hold onto before handing them to the CSV writer"""
+
 
 def folder_to_csv(folder: Path, output: Path):
     """
     Take a folder full of ROMs and catalogue them all. Useful for downloading packs from archive.org for data mining
     """
-    with open(output, "w") as csvfile:
+    with open(output, "w", buffering=CSV_BUFFER_SIZE, newline="") as csvfile:
         csvwriter = csv.writer(csvfile, delimiter=",")
         csvwriter.writerow(
             [
@@ -460,34 +503,47 @@ def folder_to_csv(folder: Path, output: Path):
                 "Weird/Bad/Missing Data",
             ]
         )
-        print(f"Discovered {len(list(folder.glob('**/*')))} files")
-        for file in folder.glob("**/*"):
-            if (
-                file.suffix == ".gb" or file.suffix == ".bin" or file.suffix == ".gbc"
-            ) and file.is_file:
-                cart = Cart.from_rom_file(file=file)
+        roms = [
+            file
+            for file in folder.glob("**/*")
+            if file.suffix in {".gb", ".gbc", ".bin"} and file.is_file()
+        ]
+        print(f"Discovered {len(roms)} files")
+        # ROM packs are full of duplicate dumps, only parse the header the first time a given ROM shows up
+        seen: typing.Dict[str, Cart] = {}
+        rows = []
+        # Every ROM is independent and hashing dominates, so spread the hashing across all cores
+        with ProcessPoolExecutor() as executor:
+            for file, (header, md5sum) in zip(roms, executor.map(Cart.read_rom_file, roms, chunksize=16)):
+                cart = seen.get(md5sum)
+                if cart is None:
+                    cart = seen[md5sum] = Cart.from_header(header, md5sum=md5sum)
                 print(f"Cataloguing {cart}...")
-                csvwriter.writerow(
+                rows.append(
                     [
                         file.name.strip(","),
                         cart.title.strip(","),
                         str(cart.hardware),
                         cart.hardware.mapper.value,
-                        str(cart.rom_banks),
-                        str(cart.ram_banks),
+                        cart.rom_banks,
+                        cart.ram_banks,
                         hex(cart.ram_size),
                         hex(cart.rom_size),
-                        str(cart.hardware.battery),
-                        str(cart.hardware.timer),
-                        str(cart.hardware.rumble),
-                        str(cart.hardware.sensor),
+                        cart.hardware.battery,
+                        cart.hardware.timer,
+                        cart.hardware.rumble,
+                        cart.hardware.sensor,
                         cart.licensee,
                         cart.old_licensee_flag,
                         cart.cgb_func.value,
-                        str(cart.sgb_flag),
+                        cart.sgb_flag,
                         cart.mask_rom_ver,
                         cart.region,
                         cart.md5sum,
-                        str(cart.is_weird)
+                        cart.weird
                     ]
-                )
\ No newline at end of file
+                )
+                if len(rows) >= CSV_BATCH_ROWS:
+                    csvwriter.writerows(rows)
+                    rows.clear()
+        csvwriter.writerows(rows)
@@ -9,6 +9,10 @@ from pathlib import Path
 UNKNOWN_STR: str = "UNKNOWN"
 
 
+_TRUE_STRS = frozenset({"True", "true", "TRUE", "1", "yes", "Yes"})
+"""Every str that str2bool treats as True"""
+
+
 def str2bool(ins: str) -> bool:
     """Turn a str representation of a bool into a bool"""
-    return True if "true" in ins.casefold() else False
+    return ins in _TRUE_STRS